@@ -1,19 +1,81 @@
-import re
-import threading
 import os
+import shutil
+import string
+import threading
+import functools
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 import boto3
 from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from s3transfer.manager import TransferManager
+from s3transfer.processpool import ProcessPoolDownloader, ProcessTransferConfig
+from s3transfer.subscribers import BaseSubscriber
+from s3transfer.utils import random_file_extension
+try:
+    from boto3.crt import create_crt_transfer_manager
+except ImportError: # awscrt is not installed, see the "crt" extra in setup.py
+    create_crt_transfer_manager = None
 
 
 class Error(Exception):
     """Base class for exceptions in this module."""
     pass
 
+logger = logging.getLogger(__name__)
+
+_S3_SCHEME = "s3://"
+_BUCKET_CHARS = string.ascii_lowercase + string.digits + ".-"
+_MAX_WORKERS = 16 # parallel object transfers per copy/move batch
+_MAX_PENDING_OBJECTS = 256 # listed objects queued ahead of the workers
+_LIST_PAGE_SIZE = 1000 # max keys per s3 ListObjectsV2 response
+_DELETE_BATCH_SIZE = 1000 # max keys per s3 DeleteObjects request
+_DELETE_WORKERS = 8 # parallel DeleteObjects requests
+_client = None
+_client_lock = threading.Lock()
+
+_MB = 1024 * 1024
+# objects above 64MB are transferred as parallel 16MB parts
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * _MB,
+    multipart_chunksize=16 * _MB,
+    max_concurrency=20,
+    use_threads=True
+)
+# the crt client manages its own threads and rejects thread related options
+_CRT_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=64 * _MB,
+    multipart_chunksize=16 * _MB
+)
+_SMALL_OBJECT_SIZE = 8 * _MB # smaller s3 objects are downloaded with a plain GetObject
+_MAX_COPY_OBJECT_SIZE = 5 * 1024 * _MB # CopyObject limit, larger objects need a multipart copy
+_PROCESS_POOL_MIN_OBJECTS = 100 # s3 to local batches with more large objects download them on processes
+_PROCESS_TRANSFER_CONFIG = ProcessTransferConfig(
+    multipart_chunksize=8 * _MB,
+    max_request_processes=10
+)
+
+def _get_s3_client():
+    """
+    returns the s3 client shared by all calls and threads, built from the boto3 default session 
+    so boto3.setup_default_session settings apply, clients are thread safe but the session 
+    creating them is not, so creation is done under a lock
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client("s3", config=Config(
+                    max_pool_connections=64, # covers transfer workers plus multipart threads
+                    retries={"max_attempts": 10, "mode": "adaptive"}
+                ))
+    return _client
+
 def _is_s3(path:str)->bool:
     """
     Determines if the path is an s3 path
     """
-    return path.startswith("s3://")
+    return path.startswith(_S3_SCHEME)
 
 def _trim_path(path):
     """
@@ -46,70 +108,87 @@ def _extract_bucket_key(s3_uri: str)->tuple:
     :param s3_uri: s3 uri of form s3://bucket_name/prefix1/prefix2/file.ext
     :return bucket, key tuple
     """
-    s3_regex="^s3://([a-z0-9.-]+)/(.*)$"
-    search =re.search(s3_regex, s3_uri)
-    if search is None:
+    bucket, sep, key = s3_uri[len(_S3_SCHEME):].partition("/")
+    # bucket must be non empty and made only of lowercase letters, digits, "." and "-"
+    if not _is_s3(s3_uri) or not sep or not bucket or bucket.strip(_BUCKET_CHARS):
         raise Error("Invalid s3 uri: {}".format(s3_uri))
-    return search.groups()
+    return bucket, key
 
-def _extract_immediate_prefix(obj_key:str)->str:
+def _get_src_prefix(src: str)->str:
     """
-    Extracts immediate prefix from source object
+    Determines the leading part of listed object names that is not carried to destination,
+    i.e. everything up to and including the immediate prefix/directory of src
     """
-    immed_prefix = ""
-    if len(obj_key.split("/")) > 1:
-        immed_prefix = obj_key.split("/")[-2]
-    
-    return immed_prefix
+    if _is_s3(src):
+        src_key = _extract_bucket_key(src)[1]
+        return src_key[:src_key.rfind("/") + 1]
+    if _is_dir(src):
+        return os.path.join(src, "") # listed files are joined onto src as given
+    return src[:src.rfind("/") + 1]
 
-def _get_dest_obj_name(initial_src, obj):
+def _trim_src_prefix(src_prefix: str, obj: str)->str:
     """
-    Determines destination object name based on initial source from use input and listed object passed
+    Determines destination object name by trimming src prefix from the listed object
     """
-    immed_prefix = ""
-    if _is_s3(initial_src):
-        immed_prefix = _extract_immediate_prefix(_extract_bucket_key(initial_src)[1])
-    else:
-        if os.path.isdir(os.path.abspath(initial_src)):
-            immed_prefix = os.path.basename(os.path.abspath(initial_src))
-        else:
-            immed_prefix = _extract_immediate_prefix(initial_src)
-    
-    if immed_prefix == "":
-        return obj
-    else:
-        return obj.split("{}/".format(immed_prefix))[-1]
+    return obj[len(src_prefix):]
 
 def _list_dir(dir_name:str)->list:
     """
-    Lists files in a dir and it's sub directories recurssively
+    Lists files in a dir and it's sub directories
     """
-    files_and_dirs = os.listdir(dir_name)
     list_of_files = []
-    for file in files_and_dirs:
-        completePath = os.path.join(dir_name, file)
-        if os.path.isdir(completePath):
-            list_of_files = list_of_files + _list_dir(completePath)
-        else:
-            list_of_files.append(completePath)
+    dirs_to_scan = [dir_name]
+    while dirs_to_scan:
+        with os.scandir(dirs_to_scan.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(): # uses cached dir entry type, no extra stat
+                    dirs_to_scan.append(entry.path)
+                else:
+                    list_of_files.append(entry.path)
 
     return list_of_files
 
-def _create_local_dir(file_path:str)->bool:
+def _create_local_dir(file_path:str, created_dirs=None)->bool:
     """
     creates local directory if does not exist
+    :param created_dirs: optional set of directories already created in this batch, 
+                         used to skip repeated makedirs calls for files sharing a directory
     """
     try:
         directory = os.path.dirname(file_path)
         if directory == "":
             return True # nothing to create
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        if created_dirs is not None and directory in created_dirs:
+            return True
+        os.makedirs(directory, exist_ok=True) # safe when workers race on the same directory
+        if created_dirs is not None:
+            created_dirs.add(directory)
     except Exception as exc:
         raise Error("Error {} occurred while creating local directory".format(exc))
     
     return True
 
+def _iter_s3_records(s3_uri: str):
+    """
+    yields raw list_objects_v2 records of non empty s3 objects in a bucket/prefix as pages arrive
+    """
+    client = _get_s3_client()
+    bucket, prefix = _extract_bucket_key(s3_uri)
+    paginator = client.get_paginator("list_objects_v2")
+    try:
+        pages = paginator.paginate(Bucket=bucket, Prefix=prefix, 
+                                   PaginationConfig={"PageSize": _LIST_PAGE_SIZE})
+        key_count = 0
+        for page in pages:
+            key_count += page["KeyCount"]
+            for record in page.get("Contents", []):
+                if record["Size"] > 0: # ignore just prefix names
+                    yield record
+    except Exception as exc:
+        raise Error("Error {} occurred while listing objects.".format(exc))
+    if key_count == 0:
+        logger.warning("Requested s3 object doesn't exist.")
+
 def aws_s3_ls(s3_uri: str, list_extended=False)->list:
     """
     list s3 objects in a bucket/prefix
@@ -117,134 +196,298 @@ def aws_s3_ls(s3_uri: str, list_extended=False)->list:
     :param list_extended: to list extedned details - owner, size, last modified and object name
     :return list of s3 objects
     """
-    client = boto3.client("s3")
-    bucket, prefix = _extract_bucket_key(s3_uri)
     s3_objects = []
-    cont_token = None
-    while (True):
-        if cont_token is None:
-            kwargs = {
-                "Bucket": bucket,
-                "MaxKeys": 100,
-                "Prefix": prefix
-            }
+    for record in _iter_s3_records(s3_uri):
+        if list_extended:
+            s3_objects.append((record["Size"], 
+                               record["LastModified"].strftime("%Y%m%d %H:%M:%S.%s"), 
+                               record["Key"]))
         else:
-            kwargs = {
-                "Bucket": bucket,
-                "MaxKeys": 100,
-                "Prefix": prefix,
-                "ContinuationToken": cont_token
-            }   
-        try:
-            response = client.list_objects_v2(**kwargs)
-            if response["KeyCount"] == 0:
-                print ("Requested s3 object doesn't exist.")
-                break
-            for record in response["Contents"]:
-                if record["Size"] > 0: # ignore just prefix names
-                    if list_extended:
-                        s3_objects.append((record["Size"], 
-                                           record["LastModified"].strftime("%Y%m%d %H:%M:%S.%s"), 
-                                           record["Key"]))
-                    else:
-                        s3_objects.append(record["Key"])
-            if response["IsTruncated"]:
-                cont_token = response["NextContinuationToken"]
-            else:
-                break
-        except Exception as exc:
-            raise Error("Error {} occurred while listing objects.".format(exc))
+            s3_objects.append(record["Key"])
     return s3_objects
 
-def _list_objects(src: str)->list:
+def _iter_objects(src: str):
     """
-    List objects based on file system
+    Iterates objects based on file system, s3 objects are yielded as listing pages arrive
+    :return iterator of (object, size, etag) tuples, size and etag are None for local files
     """
     if _is_s3(src):
-        return aws_s3_ls(src)
+        for record in _iter_s3_records(src):
+            yield record["Key"], record["Size"], record["ETag"]
     else:
         if _is_dir(src):
-            return _list_dir(src)
+            for file in _list_dir(src):
+                yield file, None, None
         else:
-            return [src]
+            yield src, None, None
+
+class _ListedObjectSubscriber(BaseSubscriber):
+    """
+    Provides the listed object size and etag to a download, s3transfer skips its HEAD 
+    request when it has both and sends the etag as IfMatch on the GetObject requests
+    """
+    def __init__(self, size, etag):
+        self._size = size
+        self._etag = etag
+
+    def on_queued(self, future, **kwargs):
+        future.meta.provide_transfer_size(self._size)
+        if hasattr(future.meta, "provide_object_etag"): # s3transfer releases before etag support
+            future.meta.provide_object_etag(self._etag)
 
-def _copy_s3_to_s3(src_bucket: str, src_key: str, dest_bucket: str, dest_key: str)->bool:
+def _listed_object_subscribers(manager, size, etag)->list:
+    """
+    returns download subscribers for a listed object, 
+    only s3transfer's TransferManager futures accept a provided size and etag
+    """
+    if size is None or etag is None or not isinstance(manager, TransferManager):
+        return None
+    return [_ListedObjectSubscriber(size, etag)]
+
+def _copy_s3_to_s3(manager, src: str, dest: str, size=None, etag=None)->bool:
     """
     copies an s3 file to another s3 bucket
     """
-    s3_resource = boto3.resource('s3')
+    src_bucket, src_key = _extract_bucket_key(src)
+    dest_bucket, dest_key = _extract_bucket_key(dest)
     copy_source = {
         'Bucket': src_bucket,
         'Key': src_key
         }
-    bucket = s3_resource.Bucket(dest_bucket)
+    # fail rather than copy a source that changed since it was listed
+    extra_args = {"CopySourceIfMatch": etag} if etag else {}
     try:
-        bucket.copy(copy_source, dest_key)
+        if size is not None and size <= _MAX_COPY_OBJECT_SIZE:
+            # single request server side copy, skips the managed copy setup
+            _get_s3_client().copy_object(Bucket=dest_bucket, Key=dest_key, CopySource=copy_source, 
+                                         **extra_args)
+        else:
+            # the managed copy keeps its HEAD, multipart copies take content type 
+            # and user metadata from it
+            manager.copy(copy_source, dest_bucket, dest_key, extra_args=extra_args).result()
     except Exception as exc:
         raise Error("Error {} occurred while working with s3 object to s3 object.".format(exc))
     
     return True
 
-def _copy_s3_to_local(src_bucket: str, src_key: str, dest: str)->bool:
+def _download_small_object(src_bucket: str, src_key: str, dest: str, etag=None)->bool:
+    """
+    downloads a small s3 object with a single GetObject streamed to disk, 
+    skipping the transfer manager bookkeeping that dominates for small files
+    """
+    extra_args = {"IfMatch": etag} if etag else {}
+    # written next to dest and renamed over it, so a failed download keeps any existing 
+    # dest and workers resolving to the same dest never interleave writes
+    temp_file = dest + os.extsep + random_file_extension()
+    try:
+        response = _get_s3_client().get_object(Bucket=src_bucket, Key=src_key, **extra_args)
+        with open(temp_file, "wb") as file:
+            shutil.copyfileobj(response["Body"], file, _MB)
+        os.replace(temp_file, dest)
+    except Exception:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    
+    return True
+
+def _copy_s3_to_local(manager, src: str, dest: str, size=None, etag=None)->bool:
     """
     copies an s3 file to local
     """
-    s3_resource = boto3.resource('s3')
+    src_bucket, src_key = _extract_bucket_key(src)
     try:
-        s3_resource.Bucket(src_bucket).download_file(src_key, dest)
+        if size is not None and size < _SMALL_OBJECT_SIZE:
+            _download_small_object(src_bucket, src_key, dest, etag)
+        else:
+            manager.download(src_bucket, src_key, dest, 
+                             subscribers=_listed_object_subscribers(manager, size, etag)).result()
     except Exception as exc:
         raise Error("Error {} occurred while working on s3 object to local.".format(exc))
     
     return True
 
-def _copy_local_to_s3(src: str, dest_bucket: str, dest_key: str)->bool:
+def _copy_local_to_s3(manager, src: str, dest: str, size=None, etag=None)->bool:
     """
     copies local file to s3
     """
-    s3_client = boto3.client('s3')
+    dest_bucket, dest_key = _extract_bucket_key(dest)
     try:
-        response = s3_client.upload_file(src, dest_bucket, dest_key)
+        manager.upload(src, dest_bucket, dest_key).result()
     except Exception as exc:
         raise Error("Error {} occurred while working on local object to s3.".format(exc))
     
     return True
 
-def _process_file_movement(src:str, dest:str, is_move=False)->bool:
+# copy function per (src is s3, dest is s3)
+_COPY_FUNCTIONS = {
+    (True, True): _copy_s3_to_s3,
+    (True, False): _copy_s3_to_local,
+    (False, True): _copy_local_to_s3
+}
+
+def _create_transfer_manager(use_crt=False):
     """
-    copies/moves s3/local folder/file to s3/local
+    creates a transfer manager on the shared s3 client, uploads and downloads run on the 
+    native aws common runtime client when awscrt is installed (boto3[crt])
+    """
+    client = _get_s3_client()
+    if use_crt and create_crt_transfer_manager is not None:
+        manager = create_crt_transfer_manager(client, _CRT_TRANSFER_CONFIG)
+        if manager is not None: # None when the crt client can't serve this client's region
+            return manager
+    return TransferManager(client, _TRANSFER_CONFIG)
+
+def _run_bounded(pool, func, items, max_pending=_MAX_PENDING_OBJECTS)->bool:
+    """
+    runs func on the pool for every item, consuming items only while fewer than 
+    max_pending calls are outstanding, so a slow producer overlaps with the workers
+    """
+    in_flight = set()
+    try:
+        for item in items:
+            if len(in_flight) >= max_pending:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            in_flight.add(pool.submit(func, item))
+        for future in as_completed(in_flight):
+            future.result()
+    except Exception:
+        for future in in_flight:
+            future.cancel() # stop scheduling the rest of the batch
+        raise
+    return True
+
+def _get_dest_path(src_prefix: str, dest: str, obj: str, to_dir: bool)->str:
+    """
+    Determines destination path of a listed object
+    :param src_prefix: src prefix from _get_src_prefix, computed once per batch
+    :param to_dir: True when src or dest is a directory, computed once per batch
+    """
+    if to_dir:
+        return _append_object(dest, _trim_src_prefix(src_prefix, obj))
+    return dest
+
+def _get_process_client_kwargs()->dict:
+    """
+    client arguments for process pool workers, which build their clients from a fresh 
+    botocore session and would otherwise miss the default session and retry config
+    """
+    client = _get_s3_client()
+    client_kwargs = {
+        "region_name": client.meta.region_name,
+        "endpoint_url": client.meta.endpoint_url,
+        "config": client.meta.config,
+    }
+    credentials = boto3._get_default_session().get_credentials()
+    if credentials is not None: # resolve the default session profile once, in the parent
+        credentials = credentials.get_frozen_credentials()
+        client_kwargs.update(aws_access_key_id=credentials.access_key,
+                             aws_secret_access_key=credentials.secret_key,
+                             aws_session_token=credentials.token)
+    return client_kwargs
+
+def _download_with_processes(src_bucket: str, src_prefix: str, dest: str, objects, 
+                             to_dir: bool, created_dirs: set, is_move=False)->bool:
+    """
+    downloads listed s3 objects to local using a pool of processes, 
+    so large download batches are not bound by the GIL
+    :param src_prefix, to_dir, created_dirs: as resolved by _process_file_movement for the batch
     """
     debug_str = "move" if (is_move) else "copy"
+    downloads = []
+    with ProcessPoolDownloader(client_kwargs=_get_process_client_kwargs(), 
+                               config=_PROCESS_TRANSFER_CONFIG) as downloader:
+        for obj, size, _ in objects:
+            temp_dest = _get_dest_path(src_prefix, dest, obj, to_dir)
+            _create_local_dir(temp_dest, created_dirs) # create dir if doesn't exist
+            logger.info("%s file s3://%s/%s to %s", debug_str, src_bucket, obj, temp_dest)
+            future = downloader.download_file(src_bucket, obj, temp_dest, expected_size=size)
+            downloads.append((obj, future))
+        for obj, future in downloads:
+            try:
+                future.result()
+            except Exception as exc:
+                raise Error("Error {} occurred while working on s3 object to local.".format(exc))
     
-    objects = _list_objects(src) # list objects
-    for obj in objects:
-        if _is_dir(dest) or _is_dir(src):
-            temp_dest = _append_object(dest, _get_dest_obj_name(src, obj))
+    if is_move: # remove downloaded sources in DeleteObjects sized batches
+        objs_list = [{"Key": obj} for obj, _ in downloads]
+        for i in range(0, len(objs_list), _DELETE_BATCH_SIZE):
+            _delete_objects(_get_s3_client(), src_bucket, objs_list[i:i + _DELETE_BATCH_SIZE])
+    return True
+
+def _is_dest_under_src(src: str, dest: str)->bool:
+    """
+    Determines if objects written to s3 dest fall under the listed s3 src prefix
+    """
+    src_bucket, src_key = _extract_bucket_key(src)
+    dest_bucket, dest_key = _extract_bucket_key(dest)
+    return src_bucket == dest_bucket and dest_key.startswith(src_key)
+
+def _hold_large_objects(objects, large_objects: list):
+    """
+    yields listed objects smaller than _SMALL_OBJECT_SIZE, appending the others to large_objects
+    """
+    for listed_obj in objects:
+        if listed_obj[1] < _SMALL_OBJECT_SIZE:
+            yield listed_obj
         else:
-            temp_dest = dest
-        
-        if _is_s3(src) and _is_s3(dest): #s3 to s3
-            src_bucket, _ = _extract_bucket_key(src)
-            dest_bucket, dest_key = _extract_bucket_key(temp_dest)
-            print(f"{debug_str} file s3://{src_bucket}/{obj} to {temp_dest}")
-            status = _copy_s3_to_s3(src_bucket, obj, dest_bucket, dest_key)
-            if status and is_move:
-                aws_s3_rm(f"s3://{src_bucket}/{obj}")
-        elif _is_s3(src): # s3 to local
-            src_bucket, _ = _extract_bucket_key(src)
-            _create_local_dir(temp_dest) # create dir if doesn't exist
-            print(f"{debug_str} file s3://{src_bucket}/{obj} to {temp_dest}")
-            status = _copy_s3_to_local(src_bucket, obj, temp_dest)
-            if status and is_move:
-                aws_s3_rm(f"s3://{src_bucket}/{obj}")
-        elif _is_s3(dest): # local to s3
-            dest_bucket, dest_key = _extract_bucket_key(temp_dest)
-            print(f"{debug_str} file {obj} to {temp_dest}")
-            status = _copy_local_to_s3(obj, dest_bucket, dest_key)
-            if status and is_move:
-                os.remove(obj)       
+            large_objects.append(listed_obj)
+
+def _process_file_movement(src:str, dest:str, direction:tuple, is_move=False)->bool:
+    """
+    copies/moves s3/local folder/file to s3/local
+    :param direction: (src is s3, dest is s3) tuple, a key of _COPY_FUNCTIONS
+    """
+    debug_str = "move" if (is_move) else "copy"
+    
+    # invariant across the batch, resolved once rather than per object
+    src_is_s3, dest_is_s3 = direction
+    to_dir = _is_dir(dest) or _is_dir(src)
+    src_prefix = _get_src_prefix(src)
+    src_bucket = _extract_bucket_key(src)[0] if src_is_s3 else None
+    copy_object = _COPY_FUNCTIONS[direction]
+    remove_object = _remove_s3_object if src_is_s3 else os.remove
+    created_dirs = set()
+    
+    def _move_object(listed_obj):
+        """
+        copies/moves a single listed object, runs on a worker thread
+        """
+        obj, size, etag = listed_obj
+        src_obj = f"s3://{src_bucket}/{obj}" if src_is_s3 else obj
+        temp_dest = _get_dest_path(src_prefix, dest, obj, to_dir)
+        if not dest_is_s3:
+            _create_local_dir(temp_dest, created_dirs) # create dir if doesn't exist
+        logger.info("%s file %s to %s", debug_str, src_obj, temp_dest)
+        status = copy_object(manager, src_obj, temp_dest, size, etag)
+        if status and is_move:
+            remove_object(src_obj)
         
         if not status:
             raise Error(f"S3 {debug_str} failed.")
+        return status
+    
+    objects = _iter_objects(src) # transfers start while listing is still in progress
+    if src_is_s3 and dest_is_s3 and _is_dest_under_src(src, dest):
+        # list everything first, otherwise later listing pages return this run's own copies
+        objects = list(objects)
+    large_objects = []
+    if src_is_s3 and not dest_is_s3:
+        # small objects take the GetObject path right away, large ones are held back 
+        # until listing ends to decide whether they are worth a process pool
+        objects = _hold_large_objects(objects, large_objects)
+    # server side copies gain nothing from the crt client
+    manager = _create_transfer_manager(use_crt=not (src_is_s3 and dest_is_s3))
+    with manager:
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
+            _run_bounded(pool, _move_object, objects)
+            if len(large_objects) <= _PROCESS_POOL_MIN_OBJECTS:
+                _run_bounded(pool, _move_object, large_objects)
+    if len(large_objects) > _PROCESS_POOL_MIN_OBJECTS:
+        return _download_with_processes(src_bucket, src_prefix, dest, large_objects, 
+                                        to_dir, created_dirs, is_move)
     return True
 
 def aws_s3_cp(src:str, dest:str)->bool:
@@ -255,10 +498,10 @@ def aws_s3_cp(src:str, dest:str)->bool:
     :param dest: dest s3 object/prefix, local file/directory
     :return True if copy is successful else False
     """
-    if _is_s3(src) or _is_s3(dest):
-        status = _process_file_movement(src, dest)
-    else:
+    direction = (_is_s3(src), _is_s3(dest))
+    if direction not in _COPY_FUNCTIONS:
         raise Error("None of the src/dest is an s3 filesystem. Use local file utils to copy.")
+    status = _process_file_movement(src, dest, direction)
     if not status:
             raise Error("S3 copy failed.")
     return True
@@ -271,40 +514,65 @@ def aws_s3_mv(src:str, dest:str)->bool:
     :param dest: dest s3 object/prefix, local file/directory
     :return True if copy is successful else False
     """
-    if _is_s3(src) or _is_s3(dest):
-        status = _process_file_movement(src, dest, True)
-    else:
+    direction = (_is_s3(src), _is_s3(dest))
+    if direction not in _COPY_FUNCTIONS:
         raise Error("None of the src/dest is an s3 filesystem. Use local file utils to move.")
+    status = _process_file_movement(src, dest, direction, True)
     if not status:
             raise Error("S3 move failed.")
     return True
 
+def _iter_key_batches(s3_uri: str, batch_size=_DELETE_BATCH_SIZE):
+    """
+    yields DeleteObjects sized lists of {"Key": key} for objects in a bucket/prefix as listing pages arrive
+    """
+    objs_list = []
+    for record in _iter_s3_records(s3_uri):
+        objs_list.append({"Key": record["Key"]})
+        if len(objs_list) == batch_size:
+            yield objs_list
+            objs_list = []
+    if objs_list:
+        yield objs_list
+
+def _delete_objects(client, s3_bucket: str, objs_list: list)->bool:
+    """
+    deletes a batch of at most 1000 objects from an s3 bucket
+    """
+    response = client.delete_objects(
+        Bucket=s3_bucket,
+        Delete={
+            'Objects': objs_list,
+            'Quiet': True
+        }
+    )
+    errors = response.get("Errors", [])
+    if errors:
+        raise Error("{} objects not deleted, first error: {}".format(len(errors), errors[0]))
+    
+    return True
+
+def _remove_s3_object(s3_uri: str)->bool:
+    """
+    deletes exactly the given s3 object, unlike aws_s3_rm which treats it as a prefix
+    """
+    s3_bucket, key = _extract_bucket_key(s3_uri)
+    return _delete_objects(_get_s3_client(), s3_bucket, [{"Key": key}])
+
 def aws_s3_rm(s3_key: str)->bool:
     """
     Delete s3 object or multiple objects from an s3 bucket.
     :param s3_key: s3 key in the form "s3://bucket_name/file_name.txt", if the s3 path ends with "/" entire prefix will be deleted
     :return True if delete is successful else False
     """
-    client = boto3.client("s3")
-    #list objects
-    objs_to_delete = aws_s3_ls(s3_key)
-    if len(objs_to_delete) ==0: # no files to delete
-        return True
+    client = _get_s3_client()
     s3_bucket, _ = _extract_bucket_key(s3_key)
-    #prepare s3 objects to delete
-    objs_list=[]
-    for obj in objs_to_delete:
-        objs_list.append({"Key": obj})
-    
     try:
-        response = client.delete_objects(
-            Bucket=s3_bucket,
-            Delete={
-                'Objects': objs_list,
-                'Quiet': False
-            }
-        )
+        with ThreadPoolExecutor(max_workers=_DELETE_WORKERS) as pool:
+            # listing pages keep arriving while earlier batches are being deleted
+            _run_bounded(pool, functools.partial(_delete_objects, client, s3_bucket), 
+                         _iter_key_batches(s3_key), max_pending=2 * _DELETE_WORKERS)
     except Exception as exc:
         raise Error("Cannot delete, exception {} occurred".format(exc))
     
-    return True
\ No newline at end of file
+    return True
@@ -1,6 +1,6 @@
 import re
-import threading
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import boto3
 from boto3.s3.transfer import TransferConfig
 
@@ -9,6 +9,8 @@ class Error(Exception):
     """Base class for exceptions in this module."""
     pass
 
+_DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4) # thread count for i/o bound s3 calls
+
 def _list_dir(dir_name:str)->list:
     """
     Lists files in a dir and it's sub directories recurssively
@@ -129,25 +131,17 @@ def aws_s3_ls(s3_uri: str, list_extended=False)->list:
     return s3_objects
 
 
-def _multithread(thread_func, iter):
-    """
-    executes given function spawning multiple threads
-    :parm thread_func function to call for each thread
-    :parm iter iterator of objects that thread works on
-    :return status True/False
-    """
-    t = []
-    # creating a lock
-    lock = threading.Lock()
-    # spawn threads
-    for i in range(8):
-        t[i] = threading.Tread(target=thread_func, args=(lock,))
-    # start threads
-    for i in range(8):
-        t[i].start()
-    # wait for threads to complete
-    for i in range(8):
-        t[i].join()
+def _parallel_map(func, items, workers=_DEFAULT_WORKERS)->list:
+    """
+    executes given function for each item on a pool of threads
+    :parm func function to call for each item
+    :parm items iterable of objects that func works on
+    :parm workers number of threads
+    :return list of results in completion order, first exception raised by func is re-raised
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, item) for item in items]
+        return [future.result() for future in as_completed(futures)]
 
 
 def _copy_s3_file_to_s3(src: str, dest: str, is_move=False)->bool:
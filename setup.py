@@ -28,5 +28,9 @@ setup(
     python_requires=">=3.6",
     install_requires=[
         "boto3"
-    ]
+    ],
+    extras_require={
+        "crt": ["boto3[crt]>=1.33"],
+        "test": ["pytest", "moto>=5"]
+    }
 )
\ No newline at end of file
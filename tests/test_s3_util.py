@@ -0,0 +1,166 @@
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from sagemaker_util import s3_util
+
+BUCKET = "test-bucket"
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        monkeypatch.setattr(s3_util, "_client", None) # client must be built inside the mock
+        monkeypatch.setattr(s3_util, "create_crt_transfer_manager", None) # crt bypasses moto
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_client_uses_default_session(s3, monkeypatch):
+    monkeypatch.setattr(boto3, "DEFAULT_SESSION", None)
+    boto3.setup_default_session(region_name="eu-west-1")
+
+    assert s3_util._get_s3_client().meta.region_name == "eu-west-1"
+
+
+def test_upload_and_download_dir(s3, tmp_path):
+    src = tmp_path / "data"
+    (src / "sub").mkdir(parents=True)
+    (src / "small.txt").write_bytes(b"hello")
+    (src / "sub" / "large.bin").write_bytes(os.urandom(9 * MB)) # above the GetObject fast path
+
+    assert s3_util.aws_s3_cp(str(src), f"s3://{BUCKET}/up/")
+    assert sorted(s3_util.aws_s3_ls(f"s3://{BUCKET}/up/")) == ["up/small.txt", "up/sub/large.bin"]
+
+    dest = tmp_path / "down"
+    assert s3_util.aws_s3_cp(f"s3://{BUCKET}/up/", f"{dest}/")
+    assert (dest / "small.txt").read_bytes() == b"hello"
+    assert (dest / "sub" / "large.bin").read_bytes() == (src / "sub" / "large.bin").read_bytes()
+
+
+def test_managed_download_skips_head(s3, tmp_path):
+    s3.put_object(Bucket=BUCKET, Key="big/large.bin", Body=os.urandom(9 * MB))
+    operations = []
+    s3_util._get_s3_client().meta.events.register(
+        "before-call.s3", lambda model, **kwargs: operations.append(model.name))
+
+    assert s3_util.aws_s3_cp(f"s3://{BUCKET}/big/large.bin", str(tmp_path / "large.bin"))
+    assert "GetObject" in operations
+    assert "HeadObject" not in operations
+
+
+def test_move_removes_only_moved_keys(s3, monkeypatch):
+    monkeypatch.setattr(s3_util, "_MAX_WORKERS", 1) # a.txt is moved before a.txt.bak is copied
+    s3.put_object(Bucket=BUCKET, Key="mv/a.txt", Body=b"a")
+    s3.put_object(Bucket=BUCKET, Key="mv/a.txt.bak", Body=b"b")
+
+    assert s3_util.aws_s3_mv(f"s3://{BUCKET}/mv/", f"s3://{BUCKET}/out/")
+    assert s3_util.aws_s3_ls(f"s3://{BUCKET}/mv/") == []
+    assert s3_util.aws_s3_ls(f"s3://{BUCKET}/out/") == ["out/a.txt", "out/a.txt.bak"]
+
+
+def test_rm_prefix(s3):
+    for i in range(7):
+        s3.put_object(Bucket=BUCKET, Key=f"rm/{i}.txt", Body=b"x")
+
+    assert s3_util.aws_s3_rm(f"s3://{BUCKET}/rm/")
+    assert s3_util.aws_s3_ls(f"s3://{BUCKET}/rm/") == []
+
+
+@pytest.mark.parametrize("src, obj, expected", [
+    ("s3://bucket/a/data/", "a/data/x/y.csv", "x/y.csv"),
+    ("s3://bucket/a/data", "a/data/x.csv", "data/x.csv"),
+    ("s3://bucket/data/", "data/x/data/y.csv", "x/data/y.csv"),
+    ("test/", "test/file.txt", "file.txt"),
+    ("a/b/f.csv", "a/b/f.csv", "f.csv"),
+    ("f.csv", "f.csv", "f.csv"),
+])
+def test_trim_src_prefix(src, obj, expected):
+    assert s3_util._trim_src_prefix(s3_util._get_src_prefix(src), obj) == expected
+
+
+def test_process_pool_only_for_large_objects(s3, tmp_path, monkeypatch):
+    monkeypatch.setattr(s3_util, "_PROCESS_POOL_MIN_OBJECTS", 1)
+    monkeypatch.setattr(s3_util, "_SMALL_OBJECT_SIZE", 10)
+    for i in range(3):
+        s3.put_object(Bucket=BUCKET, Key=f"mixed/small{i}.txt", Body=b"x")
+    for i in range(2):
+        s3.put_object(Bucket=BUCKET, Key=f"mixed/large{i}.bin", Body=b"y" * 20)
+    process_batches = []
+    monkeypatch.setattr(s3_util, "_download_with_processes",
+                        lambda src_bucket, src_prefix, dest, objects, *args: 
+                        process_batches.append(objects) or True)
+
+    assert s3_util.aws_s3_cp(f"s3://{BUCKET}/mixed/", f"{tmp_path}/")
+    assert sorted(os.listdir(tmp_path)) == ["small0.txt", "small1.txt", "small2.txt"]
+    assert [[key for key, _, _ in objects] for objects in process_batches] == [
+        ["mixed/large0.bin", "mixed/large1.bin"]]
+
+
+def test_process_pool_uses_default_session(s3, tmp_path, monkeypatch):
+    monkeypatch.setattr(s3_util, "_PROCESS_POOL_MIN_OBJECTS", 0)
+    monkeypatch.setattr(s3_util, "_SMALL_OBJECT_SIZE", 0)
+    monkeypatch.setattr(boto3, "DEFAULT_SESSION", None)
+    boto3.setup_default_session(region_name="eu-west-1", aws_access_key_id="profile-key",
+                                aws_secret_access_key="profile-secret")
+    s3.put_object(Bucket=BUCKET, Key="big/a.bin", Body=b"y")
+    created = []
+
+    class FakeDownloader:
+        def __init__(self, client_kwargs=None, config=None):
+            created.append(client_kwargs)
+        def __enter__(self):
+            return self
+        def __exit__(self, *args):
+            pass
+        def download_file(self, bucket, key, filename, expected_size=None):
+            return s3_util.ThreadPoolExecutor(1).submit(lambda: None)
+
+    monkeypatch.setattr(s3_util, "ProcessPoolDownloader", FakeDownloader)
+    assert s3_util.aws_s3_cp(f"s3://{BUCKET}/big/", f"{tmp_path}/")
+    [client_kwargs] = created
+    assert client_kwargs["region_name"] == "eu-west-1"
+    assert client_kwargs["aws_access_key_id"] == "profile-key"
+    assert client_kwargs["config"].retries["mode"] == "adaptive"
+
+
+@pytest.mark.parametrize("move", [False, True])
+def test_copy_into_sub_prefix_of_src(s3, monkeypatch, move):
+    monkeypatch.setattr(s3_util, "_LIST_PAGE_SIZE", 10) # copies land while later pages are listed
+    keys = [f"d/{i:03}.txt" for i in range(35)]
+    for key in keys:
+        s3.put_object(Bucket=BUCKET, Key=key, Body=b"x")
+
+    func = s3_util.aws_s3_mv if move else s3_util.aws_s3_cp
+    assert func(f"s3://{BUCKET}/d/", f"s3://{BUCKET}/d/x/")
+    copied = [key.replace("d/", "d/x/", 1) for key in keys]
+    expected = copied if move else keys + copied
+    assert sorted(s3_util.aws_s3_ls(f"s3://{BUCKET}/d/")) == sorted(expected)
+
+
+def test_failed_small_download_keeps_existing_file(s3, tmp_path, monkeypatch):
+    s3.put_object(Bucket=BUCKET, Key="f.txt", Body=b"new")
+    dest = tmp_path / "f.txt"
+    dest.write_bytes(b"old")
+
+    def fail_midway(src, dst, length):
+        dst.write(src.read(1))
+        raise IOError("connection reset")
+
+    with monkeypatch.context() as m:
+        m.setattr(s3_util.shutil, "copyfileobj", fail_midway)
+        with pytest.raises(IOError):
+            s3_util._download_small_object(BUCKET, "f.txt", str(dest))
+    assert dest.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["f.txt"]
+
+    assert s3_util._download_small_object(BUCKET, "f.txt", str(dest))
+    assert dest.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["f.txt"]